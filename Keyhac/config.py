@@ -2,6 +2,7 @@ import datetime
 import os
 import sys
 import fnmatch
+import functools
 import re
 import time
 import subprocess
@@ -58,11 +59,16 @@ def configure(keymap):
         job = ckit.JobItem(func, finished)
         ckit.JobQueue.defaultQueue().enqueue(job)
 
+    def noop() -> None:
+        pass
+
     ################################
     # general setting
     ################################
 
     class PathHandler:
+        _found = set()
+
         def __init__(self, path: str) -> None:
             self._path = path
 
@@ -72,11 +78,16 @@ def configure(keymap):
 
         def is_accessible(self) -> bool:
             if self._path:
+                if self._path in PathHandler._found:
+                    return True
                 try:
-                    return smart_check_path(self._path)
+                    found = smart_check_path(self._path)
                 except Exception as e:
                     print(e)
                     return ""
+                if found:
+                    PathHandler._found.add(self._path)
+                return found
             return False
 
         @staticmethod
@@ -97,14 +108,15 @@ def configure(keymap):
                 balloon("invalid-path: '{}'".format(self._path))
 
     class UserPath(PathHandler):
+        user_prof = os.environ.get("USERPROFILE") or ""
+
         def __init__(self, rel: str) -> None:
             path = self.resolve(rel)
             super().__init__(path)
 
-        @staticmethod
-        def resolve(rel: str) -> str:
-            user_prof = os.environ.get("USERPROFILE") or ""
-            return str(Path(user_prof, rel))
+        @classmethod
+        def resolve(cls, rel: str) -> str:
+            return str(Path(cls.user_prof, rel))
 
     def get_editor() -> str:
         vscode_path = UserPath(r"scoop\apps\vscode\current\Code.exe")
@@ -213,10 +225,29 @@ def configure(keymap):
     # key remap
     ################################
 
+    class WndInfo(NamedTuple):
+        process_name: str
+        class_name: str
+
     class CheckWnd:
-        @staticmethod
-        def is_browser(wnd: pyauto.Window) -> bool:
-            return wnd.getProcessName() in ("chrome.exe", "vivaldi.exe", "firefox.exe")
+        browsers = frozenset(("chrome.exe", "vivaldi.exe", "firefox.exe"))
+        _cache: Dict[int, WndInfo] = {}
+        _cache_limit = 32
+
+        @classmethod
+        def get_info(cls, wnd: pyauto.Window) -> WndInfo:
+            hwnd = wnd.getHWND()
+            info = cls._cache.get(hwnd)
+            if info is None:
+                if cls._cache_limit <= len(cls._cache):
+                    cls._cache.clear()
+                info = WndInfo(wnd.getProcessName(), wnd.getClassName())
+                cls._cache[hwnd] = info
+            return info
+
+        @classmethod
+        def is_browser(cls, wnd: pyauto.Window) -> bool:
+            return cls.get_info(wnd).process_name in cls.browsers
 
         @classmethod
         def is_global_target(cls, wnd: pyauto.Window) -> bool:
@@ -239,39 +270,42 @@ def configure(keymap):
     class CoreKeys:
         mod_keys = ("", "S-", "C-", "A-", "C-S-", "C-A-", "S-A-", "C-A-S-")
         key_status = ("D-", "U-")
+        kana_vks = tuple(str(vk) for vk in (*range(124, 136), *range(240, 243), *range(245, 254)))
+        cursor_map = (
+            # move cursor
+            ("H", "Left"),
+            ("J", "Down"),
+            ("K", "Up"),
+            ("L", "Right"),
+            # Back / Delete
+            ("B", "Back"),
+            ("D", "Delete"),
+            # Home / End
+            ("A", "Home"),
+            ("E", "End"),
+            # Enter
+            ("Space", "Enter"),
+        )
 
         @classmethod
         def cursor_keys(cls, km: WindowKeymap) -> None:
             for mod_key in cls.mod_keys:
-                for key, value in {
-                    # move cursor
-                    "H": "Left",
-                    "J": "Down",
-                    "K": "Up",
-                    "L": "Right",
-                    # Back / Delete
-                    "B": "Back",
-                    "D": "Delete",
-                    # Home / End
-                    "A": "Home",
-                    "E": "End",
-                    # Enter
-                    "Space": "Enter",
-                }.items():
-                    km[mod_key + "U0-" + key] = mod_key + value
+                trigger = mod_key + "U0-"
+                for key, value in cls.cursor_map:
+                    km[trigger + key] = mod_key + value
 
         @classmethod
         def ignore_capslock(cls, km: WindowKeymap) -> None:
             for stat in cls.key_status:
                 for mod_key in cls.mod_keys:
-                    km[mod_key + stat + "Capslock"] = lambda: None
+                    km[mod_key + stat + "Capslock"] = noop
 
         @classmethod
         def ignore_kanakey(cls, km: WindowKeymap) -> None:
             for stat in cls.key_status:
                 for mod_key in cls.mod_keys:
-                    for vk in list(range(124, 136)) + list(range(240, 243)) + list(range(245, 254)):
-                        km[mod_key + stat + str(vk)] = lambda: None
+                    for vk in cls.kana_vks:
+                        km[mod_key + stat + vk] = noop
 
     CoreKeys().cursor_keys(keymap_global)
     # CoreKeys().ignore_capslock(keymap_global)
@@ -385,16 +419,23 @@ def configure(keymap):
 
         def type_keys(self, *keys) -> None:
             self._prepare()
-            for key in keys:
-                delay(self._inter_stroke_pause)
-                self._keymap.setInput_FromString(str(key))
+            if self._inter_stroke_pause:
+                for key in keys:
+                    delay(self._inter_stroke_pause)
+                    self._keymap.setInput_FromString(str(key))
+            else:
+                for key in keys:
+                    self._keymap.setInput_FromString(str(key))
             self._finish()
 
         def type_text(self, s: str) -> None:
             self._prepare()
-            for c in str(s):
-                delay(self._inter_stroke_pause)
-                self._keymap.input_seq.append(pyauto.Char(c))
+            if self._inter_stroke_pause:
+                for c in str(s):
+                    delay(self._inter_stroke_pause)
+                    self._keymap.input_seq.append(pyauto.Char(c))
+            else:
+                self._keymap.input_seq.extend([pyauto.Char(c) for c in str(s)])
             self._finish()
 
         def type_smart(self, *sequence) -> None:
@@ -405,11 +446,21 @@ def configure(keymap):
                     self.type_text(elem)
 
         def type_sequence(self, sequence: List[Key]) -> None:
+            if self._inter_stroke_pause:
+                for key in sequence:
+                    if key.typable:
+                        self.type_keys(key.sent)
+                    else:
+                        self.type_text(key.sent)
+                return
+            self._prepare()
             for key in sequence:
                 if key.typable:
-                    self.type_keys(key.sent)
+                    self._keymap.setInput_FromString(str(key.sent))
                 else:
-                    self.type_text(key.sent)
+                    self._keymap.setInput_Modifier(0)
+                    self._keymap.input_seq.extend([pyauto.Char(c) for c in str(key.sent)])
+            self._finish()
 
     VIRTUAL_FINGER = VirtualFinger(keymap, 10)
     VIRTUAL_FINGER_QUICK = VirtualFinger(keymap, 0)
@@ -465,10 +516,16 @@ def configure(keymap):
     IME_CONTROL = ImeControl(keymap)
 
     class ClipHandler:
+        max_scan = 500 * 1024
+
         @staticmethod
         def get_string() -> str:
             return ckit.getClipboardText() or ""
 
+        @classmethod
+        def truncate(cls, s: str) -> str:
+            return s[: cls.max_scan]
+
         @staticmethod
         def set_string(s: str) -> None:
             ckit.setClipboardText(str(s))
@@ -488,20 +545,28 @@ def configure(keymap):
         @classmethod
         def after_copy(cls, deferred: Callable) -> None:
             cb = cls.get_string()
+            seq = ckit.getClipboardSequenceNumber()
             VIRTUAL_FINGER.type_keys("C-C")
 
             def _watch_clipboard(job_item: ckit.JobItem) -> None:
                 job_item.origin = cb
                 job_item.copied = ""
-                interval = 10
-                timeout = interval * 20
+                changed = False
+                interval = 1
+                timeout = 200
                 while timeout > 0:
                     delay(interval)
+                    timeout -= interval
+                    if not changed:
+                        if ckit.getClipboardSequenceNumber() == seq:
+                            interval = min(interval * 2, 16)
+                            continue
+                        changed = True
+                        interval = 10
                     s = cls.get_string()
                     if 0 < len(s.strip()) and s != job_item.origin:
                         job_item.copied = s
                         return
-                    timeout -= interval
 
             subthread_run(_watch_clipboard, deferred)
 
@@ -593,9 +658,11 @@ def configure(keymap):
 
     # paste as plaintext (with trimming removable whitespaces)
     class StrCleaner:
-        @staticmethod
-        def clear_space(s: str) -> str:
-            return s.strip().translate(str.maketrans("", "", "\u200b\u3000\u0009\u0020\u00a0"))
+        _spaces = str.maketrans("", "", "\u200b\u3000\u0009\u0020\u00a0")
+
+        @classmethod
+        def clear_space(cls, s: str) -> str:
+            return s.strip().translate(cls._spaces)
 
         @classmethod
         def invoke(cls, remove_white: bool = False, include_linebreak: bool = False) -> Callable:
@@ -633,8 +700,8 @@ def configure(keymap):
         def _formatter(s: str) -> str:
             lines = s.strip().splitlines()
             if join_lines:
-                return "> " + "".join([line.strip() for line in lines])
-            return os.linesep.join(["> " + line for line in lines])
+                return "> " + "".join(line.strip() for line in lines)
+            return os.linesep.join("> " + line for line in lines)
 
         def _paster() -> None:
             ClipHandler().paste_current(_formatter)
@@ -651,7 +718,7 @@ def configure(keymap):
                 u = job_item.copied
             else:
                 u = job_item.origin
-            shell_exec(u.strip())
+            shell_exec(ClipHandler.truncate(u).strip())
 
         ClipHandler().after_copy(_open)
 
@@ -662,15 +729,35 @@ def configure(keymap):
     ################################
 
     class ConfigMenu:
-        def __init__(self, keymap: Keymap) -> None:
+        def __init__(self, keymap: Keymap, reload_debounce_msec: int = 250) -> None:
             self._keymap = keymap
-
-        @staticmethod
-        def paste_config() -> None:
-            s = Path(ckit.dataPath(), "config.py").read_text("utf-8")
-            ClipHandler().paste(s)
+            self._reload_debounce_msec = reload_debounce_msec
+            self._reload_request = 0
+            self._config_mtime = None
+            self._config_text = ""
+
+        def read_config(self) -> str:
+            path = Path(ckit.dataPath(), "config.py")
+            mtime = path.stat().st_mtime
+            if mtime != self._config_mtime:
+                self._config_text = path.read_text("utf-8")
+                self._config_mtime = mtime
+            return self._config_text
+
+        def paste_config(self) -> None:
+            ClipHandler().paste(self.read_config())
 
         def reload_config(self) -> None:
+            self._reload_request += 1
+            request = self._reload_request
+
+            def _reload() -> None:
+                if request == self._reload_request:
+                    self._reload()
+
+            self._keymap.delayedCall(_reload, self._reload_debounce_msec)
+
+        def _reload(self) -> None:
             ckit.JobQueue.cancelAll()
             self._keymap.configure()
             self._keymap.updateKeymap()
@@ -716,7 +803,7 @@ def configure(keymap):
                 "C-E": self.open_skk_repo,
                 "P": self.paste_config,
                 "S": self.open_skk_config,
-                "X": lambda: None,
+                "X": noop,
             }.items():
                 km[key] = LAZY_KEYMAP.wrap(func).defer(50)
 
@@ -726,7 +813,7 @@ def configure(keymap):
 
     keymap.editor = lambda _: CONFIG_MENU.open_keyhac_repo()
 
-    keymap_global["U1-F12"] = LAZY_KEYMAP.wrap(ConfigMenu(keymap).reload_config).defer(50)
+    keymap_global["U1-F12"] = LAZY_KEYMAP.wrap(CONFIG_MENU.reload_config).defer(50)
 
     ################################
     # class for position on monitor
@@ -839,7 +926,15 @@ def configure(keymap):
                 self.area_mapping[pos] = d
 
     class CurrentMonitors:
+        _cache = None
+
         def __init__(self, keymap: Keymap) -> None:
+            if CurrentMonitors._cache is None:
+                CurrentMonitors._cache = self.scan(keymap)
+            self._monitors = CurrentMonitors._cache
+
+        @staticmethod
+        def scan(keymap: Keymap) -> list:
             ms = []
             for mi in pyauto.Window.getMonitorInfo():
                 mr = MonitorRect(keymap, Rect(*mi[1]))
@@ -850,7 +945,7 @@ def configure(keymap):
                     ms.insert(0, mr)
                 else:
                     ms.append(mr)
-            self._monitors = ms
+            return ms
 
         @property
         def monitors(self) -> list:
@@ -870,20 +965,13 @@ def configure(keymap):
                     y = monitor.top + int(monitor.max_height / 2)
                     x = monitor.left + int(monitor.max_width / 4) * i
                     self.pos.append([x, y])
-
-        def get_position_index(self) -> int:
-            x, y = pyauto.Input.getCursorPos()
+            self._next_pos = {}
             for i, p in enumerate(self.pos):
-                if p[0] == x and p[1] == y:
-                    return i
-            return -1
+                self._next_pos.setdefault(tuple(p), self.pos[(i + 1) % len(self.pos)])
 
         def snap(self) -> None:
-            idx = self.get_position_index()
-            if idx < 0 or idx == len(self.pos) - 1:
-                self.set_position(*self.pos[0])
-            else:
-                self.set_position(*self.pos[idx + 1])
+            cur = tuple(pyauto.Input.getCursorPos())
+            self.set_position(*self._next_pos.get(cur, self.pos[0]))
 
         def set_position(self, x: int, y: int) -> None:
             self._keymap.beginInput()
@@ -907,6 +995,7 @@ def configure(keymap):
     ################################
 
     def apply_window_mover(km: WindowKeymap) -> None:
+        commands = {}
         for key, delta in {
             "Left": (-10, 0),
             "Right": (+10, 0),
@@ -915,7 +1004,10 @@ def configure(keymap):
         }.items():
             x, y = delta
             for mod, scale in {"": 15, "S-": 5, "C-": 5, "S-C-": 1}.items():
-                km[mod + "U0-" + key] = keymap.MoveWindowCommand(x * scale, y * scale)
+                move = (x * scale, y * scale)
+                if move not in commands:
+                    commands[move] = keymap.MoveWindowCommand(*move)
+                km[mod + "U0-" + key] = commands[move]
 
     apply_window_mover(keymap_global)
 
@@ -1082,8 +1174,8 @@ def configure(keymap):
         kana = 1
 
     class SKK:
-        def __init__(self, keymap: Keymap, finish_mode: SKKMode = SKKMode.kana) -> None:
-            self._base_skk = SimpleSKK(keymap)
+        def __init__(self, base_skk: SimpleSKK, finish_mode: SKKMode = SKKMode.kana) -> None:
+            self._base_skk = base_skk
             self._finish_mode = finish_mode
 
         def invoke_sender(self, *sequence) -> Callable:
@@ -1113,9 +1205,9 @@ def configure(keymap):
             for key, sent in mapping_dict.items():
                 km[key] = self.invoke_pair_sender(sent)
 
-    SKK_TO_KANAMODE = SKK(keymap, SKKMode.kana)
-    SKK_TO_LATINMODE = SKK(keymap, SKKMode.latin)
-    SKK_TO_DISABLE = SKK(keymap, SKKMode.disabled)
+    SKK_TO_KANAMODE = SKK(SIMPLE_SKK, SKKMode.kana)
+    SKK_TO_LATINMODE = SKK(SIMPLE_SKK, SKKMode.latin)
+    SKK_TO_DISABLE = SKK(SIMPLE_SKK, SKKMode.disabled)
 
     # insert honorific
     def type_honorific(km: WindowKeymap) -> None:
@@ -1190,12 +1282,11 @@ def configure(keymap):
         def invoke(fmt: str, finish_with_kanamode: bool = False) -> Callable:
             def _inputter() -> None:
                 def _get_func(job_item: ckit.JobItem) -> None:
-                    d = datetime.datetime.today()
-                    seq = [c for c in d.strftime(fmt)]
+                    d = datetime.datetime.today().strftime(fmt)
                     if finish_with_kanamode:
-                        job_item.func = SKK_TO_KANAMODE.invoke_sender(*seq)
+                        job_item.func = SKK_TO_KANAMODE.invoke_sender(d)
                     else:
-                        job_item.func = SKK_TO_LATINMODE.invoke_sender(*seq)
+                        job_item.func = SKK_TO_LATINMODE.invoke_sender(d)
 
                 def _input(job_item: ckit.JobItem) -> None:
                     job_item.func()
@@ -1445,10 +1536,11 @@ def configure(keymap):
             "\u2fd4": "\u9f9c",
             "\u2fd5": "\u9fa0",
         }
+        _table = str.maketrans(mapping)
 
         @classmethod
         def fix(cls, s: str) -> str:
-            return s.translate(str.maketrans(cls.mapping))
+            return s.translate(cls._table)
 
     class UnicodeMapper:
         def __init__(self, repl: str) -> None:
@@ -1461,10 +1553,9 @@ def configure(keymap):
         def register(self, char_code: int) -> None:
             self._mapping[char_code] = self._repl
 
-        def register_range(self, pair: list) -> None:
+        def register_range(self, pair: tuple) -> None:
             start, end = pair
-            for i in range(int(start, 16), int(end, 16) + 1):
-                self.register(i)
+            self._mapping.update(dict.fromkeys(range(start, end + 1), self._repl))
 
         def register_ranges(self, pairs: list) -> None:
             for pair in pairs:
@@ -1477,56 +1568,64 @@ def configure(keymap):
     class SearchNoiseMapping:
         def __init__(self, repl: str) -> None:
             _mapper = UnicodeMapper(repl)
-            _mapper.register(int("30FB", 16))  # KATAKANA MIDDLE DOT
-            _mapper.register_range(["2018", "201F"])  # quotation
-            _mapper.register_range(["2E80", "2EF3"])  # kangxi
+            _mapper.register(0x30FB)  # KATAKANA MIDDLE DOT
+            _mapper.register_range((0x2018, 0x201F))  # quotation
+            _mapper.register_range((0x2E80, 0x2EF3))  # kangxi
             _mapper.register_ranges(
                 [  # ascii
-                    ["0021", "002F"],
-                    ["003A", "0040"],
-                    ["005B", "0060"],
-                    ["007B", "007E"],
+                    (0x0021, 0x002F),
+                    (0x003A, 0x0040),
+                    (0x005B, 0x0060),
+                    (0x007B, 0x007E),
                 ]
             )
             _mapper.register_ranges(
                 [  # bars
-                    ["2010", "2017"],
-                    ["2500", "2501"],
-                    ["2E3A", "2E3B"],
+                    (0x2010, 0x2017),
+                    (0x2500, 0x2501),
+                    (0x2E3A, 0x2E3B),
                 ]
             )
             _mapper.register_ranges(
                 [  # fullwidth
-                    ["25A0", "25EF"],
-                    ["3000", "3004"],
-                    ["3008", "3040"],
-                    ["3097", "30A0"],
-                    ["3097", "30A0"],
-                    ["30FD", "30FF"],
-                    ["FF01", "FF0F"],
-                    ["FF1A", "FF20"],
-                    ["FF3B", "FF40"],
-                    ["FF5B", "FF65"],
+                    (0x25A0, 0x25EF),
+                    (0x3000, 0x3004),
+                    (0x3008, 0x3040),
+                    (0x3097, 0x30A0),
+                    (0x30FD, 0x30FF),
+                    (0xFF01, 0xFF0F),
+                    (0xFF1A, 0xFF20),
+                    (0xFF3B, 0xFF40),
+                    (0xFF5B, 0xFF65),
                 ]
             )
 
-            self._mapping = _mapper.mapping
+            # code point to code point: usable as a translate table as is
+            self._table = dict(_mapper.mapping)
+            _mapper.register_range((0x3041, 0x3093))  # hiragana
+            self._table_with_hiragana = dict(_mapper.mapping)
+            ascii_noise = "".join(chr(c) for c in self._table if c < 0x80)
+            self._reg_ascii_noise = re.compile("[{}]".format(re.escape(ascii_noise)))
 
-        def cleanup(self, s: str) -> str:
-            return s.translate(str.maketrans(self._mapping))
+        def cleanup(self, s: str, strip_hiragana: bool = False) -> str:
+            if s.isascii() and not self._reg_ascii_noise.search(s):
+                return s
+            if strip_hiragana:
+                return s.translate(self._table_with_hiragana)
+            return s.translate(self._table)
 
     SEARCH_NOISE_MAPPIING = SearchNoiseMapping(" ")
 
     class SearchQuery:
+        _reg_honorific = re.compile("先生|様")
+        _reg_editorial_style = re.compile(r"分担執筆|共編著|監修|共著|編著|共編|et al\.")
+        _spaces = str.maketrans({"\u200b": None, "\u3000": " ", "\t": " "})
+        _reg_word = re.compile(r"[^ ]+")
+
         def __init__(self, query: str) -> None:
             self._query = ""
-            lines = (
-                query.strip()
-                .replace("\u200b", "")
-                .replace("\u3000", " ")
-                .replace("\t", " ")
-                .splitlines()
-            )
+            self._strip_hiragana = False
+            lines = query.strip().translate(self._spaces).splitlines()
             for line in lines:
                 self._query += self.format_line(line)
 
@@ -1541,27 +1640,25 @@ def configure(keymap):
             return ""
 
         def fix_kangxi(self) -> None:
-            self._query = KangxiRadicals().fix(self._query)
+            self._query = KangxiRadicals.fix(self._query)
 
         def remove_honorific(self) -> None:
-            for honor in ["先生", "様"]:
-                self._query = self._query.replace(honor, " ")
+            if "様" in self._query or "先生" in self._query:
+                self._query = self._reg_honorific.sub(" ", self._query)
 
         def remove_editorial_style(self) -> None:
-            for honor in ["監修", "共著", "編著", "共編著", "共編", "分担執筆", "et al."]:
-                self._query = self._query.replace(honor, " ")
+            if self._query.isascii() and "et al." not in self._query:
+                return
+            self._query = self._reg_editorial_style.sub(" ", self._query)
 
         def remove_hiragana(self) -> None:
-            self._query = re.sub(r"[\u3041-\u3093]", " ", self._query)
+            self._strip_hiragana = True
 
         def encode(self, strict: bool = False) -> str:
-            words = []
-            for word in SEARCH_NOISE_MAPPIING.cleanup(self._query).split(" "):
-                if len(word):
-                    if strict:
-                        words.append('"{}"'.format(word))
-                    else:
-                        words.append(word)
+            query = SEARCH_NOISE_MAPPIING.cleanup(self._query, self._strip_hiragana)
+            words = self._reg_word.findall(query)
+            if strict:
+                return urllib.parse.quote(" ".join('"' + word + '"' for word in words))
             return urllib.parse.quote(" ".join(words))
 
     class WebSearcher:
@@ -1570,21 +1667,24 @@ def configure(keymap):
             self._uri_mapping = uri_mapping
 
         @staticmethod
-        def invoke(uri: str, strict: bool = False, strip_hiragana: bool = False) -> Callable:
+        def search(uri: str, strict: bool, strip_hiragana: bool, job_item: ckit.JobItem) -> None:
+            s = job_item.copied
+            if len(s) < 1:
+                s = job_item.origin
+            query = SearchQuery(ClipHandler.truncate(s))
+            query.fix_kangxi()
+            query.remove_honorific()
+            query.remove_editorial_style()
+            if strip_hiragana:
+                query.remove_hiragana()
+            shell_exec(uri.format(query.encode(strict)))
+
+        @classmethod
+        def invoke(cls, uri: str, strict: bool = False, strip_hiragana: bool = False) -> Callable:
+            search = functools.partial(cls.search, uri, strict, strip_hiragana)
+
             def _searcher() -> None:
-                def _search(job_item: ckit.JobItem) -> None:
-                    s = job_item.copied
-                    if len(s) < 1:
-                        s = job_item.origin
-                    query = SearchQuery(s)
-                    query.fix_kangxi()
-                    query.remove_honorific()
-                    query.remove_editorial_style()
-                    if strip_hiragana:
-                        query.remove_hiragana()
-                    shell_exec(uri.format(query.encode(strict)))
-
-                ClipHandler().after_copy(_search)
+                ClipHandler().after_copy(search)
 
             return LAZY_KEYMAP.wrap(_searcher).defer()
 
@@ -1637,14 +1737,18 @@ def configure(keymap):
             prog_id = str(QueryValueEx(key, "ProgId")[0])
 
         @classmethod
+        @functools.lru_cache(maxsize=1)
         def get_commandline(cls) -> str:
             register_path = r"{}\shell\open\command".format(cls.prog_id)
             with OpenKey(HKEY_CLASSES_ROOT, register_path) as key:
                 return str(QueryValueEx(key, "")[0])
 
+        _reg_exe = re.compile(r"(^.+\.exe)(.*)")
+
         @classmethod
+        @functools.lru_cache(maxsize=1)
         def get_exe_path(cls) -> str:
-            return re.sub(r"(^.+\.exe)(.*)", r"\1", cls.get_commandline()).replace('"', "")
+            return cls._reg_exe.sub(r"\1", cls.get_commandline()).replace('"', "")
 
         @classmethod
         def get_exe_name(cls) -> str:
@@ -1665,6 +1769,15 @@ def configure(keymap):
             self.exe_name = exe_name
             self.class_name = class_name
             self.found = None
+            self._match_exe = self.get_matcher(exe_name)
+            self._match_class = self.get_matcher(class_name)
+
+        @staticmethod
+        def get_matcher(pattern: str) -> Callable:
+            if any(c in pattern for c in "*?["):
+                return lambda name: fnmatch.fnmatch(name, pattern)
+            pattern = pattern.lower()
+            return lambda name: name.lower() == pattern
 
         def scan(self) -> None:
             self.found = None
@@ -1675,9 +1788,9 @@ def configure(keymap):
                 return True
             if not wnd.isEnabled():
                 return True
-            if not fnmatch.fnmatch(wnd.getProcessName(), self.exe_name):
+            if not self._match_exe(wnd.getProcessName()):
                 return True
-            if self.class_name and not fnmatch.fnmatch(wnd.getClassName(), self.class_name):
+            if self.class_name and not self._match_class(wnd.getClassName()):
                 return True
             if len(wnd.getText()) < 1:
                 return True
@@ -1826,7 +1939,7 @@ def configure(keymap):
     keymap_global["LS-LC-U1-M"] = UserPath(r"Personal\draft.txt").run
 
     def search_on_browser() -> None:
-        if keymap.getWindow().getProcessName() == DEFAULT_BROWSER.get_exe_name():
+        if CheckWnd.get_info(keymap.getWindow()).process_name == DEFAULT_BROWSER.get_exe_name():
             VIRTUAL_FINGER.type_keys("C-T")
             return
 
@@ -1859,12 +1972,12 @@ def configure(keymap):
     # browser
     keymap_browser = keymap.defineWindowKeymap(check_func=CheckWnd.is_browser)
     keymap_browser["LC-LS-W"] = "A-Left"
-    keymap_browser["LC-L"] = KeyPuncher(keymap, defer_msec=50, recover_ime=False).invoke("C-L")
-    keymap_browser["LC-F"] = KeyPuncher(keymap, defer_msec=50, recover_ime=False).invoke("C-F")
+    keymap_browser["LC-L"] = GENTLE_PUNCHER.invoke("C-L")
+    keymap_browser["LC-F"] = GENTLE_PUNCHER.invoke("C-F")
 
     # intra
     keymap_intra = keymap.defineWindowKeymap(exe_name="APARClientAWS.exe")
-    keymap_intra["O-(235)"] = lambda: None
+    keymap_intra["O-(235)"] = noop
 
     # slack
     keymap_slack = keymap.defineWindowKeymap(exe_name="slack.exe", class_name="Chrome_WidgetWin_1")
@@ -1877,12 +1990,12 @@ def configure(keymap):
     # vscode
     keymap_vscode = keymap.defineWindowKeymap(exe_name="Code.exe")
 
-    def remap_vscode(keys: list, km: WindowKeymap) -> Callable:
+    def remap_vscode(keys: tuple, km: WindowKeymap) -> None:
         for key in keys:
             km[key] = MILD_PUNCHER.invoke(key)
 
     remap_vscode(
-        [
+        (
             "C-E",
             "C-S-F",
             "C-S-E",
@@ -1891,18 +2004,14 @@ def configure(keymap):
             "C-0",
             "C-S-P",
             "C-A-B",
-        ],
+        ),
         keymap_vscode,
     )
 
     # mery
     keymap_mery = keymap.defineWindowKeymap(exe_name="Mery.exe")
 
-    def remap_mery(mapping_dict: dict, km: WindowKeymap) -> Callable:
-        for key, value in mapping_dict.items():
-            km[key] = value
-
-    remap_mery(
+    KeyAllocator(
         {
             "LA-LC-J": "LA-LC-N",
             "LA-LC-K": "LA-LC-LS-N",
@@ -1912,16 +2021,16 @@ def configure(keymap):
             "LA-LC-U0-K": "A-C-OpenBracket",
             "LA-LS-U0-J": "A-S-CloseBracket",
             "LA-LS-U0-K": "A-S-OpenBracket",
-        },
-        keymap_mery,
-    )
+        }
+    ).apply(keymap_mery)
 
     # sumatra PDF
     def sumatra_checker(viewmode: bool = False) -> Callable:
         def _checker(wnd: pyauto.Window) -> bool:
-            if wnd.getProcessName() == "SumatraPDF.exe":
+            info = CheckWnd.get_info(wnd)
+            if info.process_name == "SumatraPDF.exe":
                 if viewmode:
-                    return wnd.getClassName() != "Edit"
+                    return info.class_name != "Edit"
                 return True
             return False
 
@@ -1933,15 +2042,21 @@ def configure(keymap):
 
     keymap_sumatra_viewmode = keymap.defineWindowKeymap(check_func=sumatra_checker(True))
 
-    def sumatra_view_key(km: WindowKeymap) -> None:
+    def sumatra_view_key(km: WindowKeymap, overrides: dict) -> None:
         for key in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-            km[key] = GENTLE_PUNCHER.invoke(key)
-
-    sumatra_view_key(keymap_sumatra_viewmode)
+            if key in overrides:
+                km[key] = overrides[key]
+            else:
+                km[key] = GENTLE_PUNCHER.invoke(key)
 
-    keymap_sumatra_viewmode["F"] = SIMPLE_SKK.under_kanamode("C-F")
-    keymap_sumatra_viewmode["H"] = "C-S-Tab"
-    keymap_sumatra_viewmode["L"] = "C-Tab"
+    sumatra_view_key(
+        keymap_sumatra_viewmode,
+        {
+            "F": SIMPLE_SKK.under_kanamode("C-F"),
+            "H": "C-S-Tab",
+            "L": "C-Tab",
+        },
+    )
 
     def office_to_pdf(km: WindowKeymap, key: str = "F11") -> None:
         km[key] = "A-F", "E", "P", "A"
@@ -1960,7 +2075,7 @@ def configure(keymap):
     office_to_pdf(keymap_excel)
 
     def select_all() -> None:
-        if keymap.getWindow().getClassName() == "EXCEL6":
+        if CheckWnd.get_info(keymap.getWindow()).class_name == "EXCEL6":
             VIRTUAL_FINGER.type_keys("C-End", "C-S-Home")
         else:
             VIRTUAL_FINGER.type_keys("C-A")
@@ -1968,7 +2083,7 @@ def configure(keymap):
     keymap_excel["C-A"] = select_all
 
     def select_cell_content() -> None:
-        if keymap.getWindow().getClassName() == "EXCEL7":
+        if CheckWnd.get_info(keymap.getWindow()).class_name == "EXCEL7":
             VIRTUAL_FINGER.type_keys("F2", "C-S-Home")
 
     keymap_excel["LC-U0-N"] = select_cell_content
@@ -1985,54 +2100,78 @@ def configure(keymap):
         full_brackets = "\uff08\uff09\uff3b\uff3d\uff5b\uff5d"
         half_brackets = "()[]{}"
 
+        _full_to_half_letters = str.maketrans(full_letters, half_letters)
+        _half_to_full_letters = str.maketrans(half_letters, full_letters)
+        _full_to_half_symbols = str.maketrans(full_symbols, half_symbols)
+        _half_to_full_symbols = str.maketrans(half_symbols, full_symbols)
+        _full_to_half_brackets = str.maketrans(full_brackets, half_brackets)
+        _half_to_full_brackets = str.maketrans(half_brackets, full_brackets)
+        _half_to_full_all = str.maketrans(half_letters + half_symbols, full_letters + full_symbols)
+
         def __init__(self, totally: bool = False) -> None:
             self._totally = totally
+            if totally:
+                self._to_full = self._half_to_full_all
+            else:
+                self._to_full = self._half_to_full_letters
 
         def to_half_letter(self, s: str) -> str:
             if self._totally:
                 return unicodedata.normalize("NFKC", s)
-            return s.translate(str.maketrans(self.full_letters, self.half_letters))
+            return s.translate(self._full_to_half_letters)
 
         def to_full_letter(self, s: str) -> str:
-            s = s.translate(str.maketrans(self.half_letters, self.full_letters))
-            if not self._totally:
-                return s
-            return self.to_full_symbol(s)
+            return s.translate(self._to_full)
 
         @classmethod
         def to_half_symbol(cls, s: str) -> str:
-            return s.translate(str.maketrans(cls.full_symbols, cls.half_symbols))
+            return s.translate(cls._full_to_half_symbols)
 
         @classmethod
         def to_full_symbol(cls, s: str) -> str:
-            return s.translate(str.maketrans(cls.half_symbols, cls.full_symbols))
+            return s.translate(cls._half_to_full_symbols)
 
         @classmethod
         def to_half_brackets(cls, s: str) -> str:
-            return s.translate(str.maketrans(cls.full_brackets, cls.half_brackets))
+            return s.translate(cls._full_to_half_brackets)
 
         @classmethod
         def to_full_brackets(cls, s: str) -> str:
-            return s.translate(str.maketrans(cls.half_brackets, cls.full_brackets))
+            return s.translate(cls._half_to_full_brackets)
+
+    CHAR_WIDTH = CharWidth()
+    CHAR_WIDTH_TOTALLY = CharWidth(True)
 
     class Zoom:
         separator = ": "
         hr = "=============================="
+        weekdays = ("月", "火", "水", "木", "金", "土", "日")
+        template = os.linesep.join([hr, "{}", "{}", "{}", "", "{}", "{}", hr])
+        reg_time = re.compile(
+            r"時刻: (\d{4})年(\d{1,2})月(\d{1,2})日 (\d{1,2}):(\d{1,2})(?: (AM|PM))? 大阪、札幌、東京",
+            re.IGNORECASE,
+        )
 
-        @staticmethod
-        def get_time(s) -> str:
-            try:
-                d = datetime.datetime.strptime(s, "時刻: %Y年%m月%d日 %I:%M %p 大阪、札幌、東京")
-            except:
-                try:
-                    d = datetime.datetime.strptime(s, "時刻: %Y年%m月%d日 %H:%M 大阪、札幌、東京")
-                except:
+        @classmethod
+        def get_time(cls, s) -> str:
+            m = cls.reg_time.fullmatch(s)
+            if not m:
+                return ""
+            y, mo, d, h, mi = (int(g) for g in m.groups()[:5])
+            meridiem = m.group(6)
+            if meridiem:
+                if not 1 <= h <= 12:
                     return ""
-            week = "月火水木金土日"[d.weekday()]
+                h = h % 12 + 12 * (meridiem.upper() == "PM")
+            try:
+                week = cls.weekdays[datetime.date(y, mo, d).weekday()]
+                datetime.time(h, mi)
+            except ValueError:
+                return ""
             ampm = ""
-            if d.hour < 12:
+            if h < 12:
                 ampm = "AM "
-            return (d.strftime("%Y年%m月%d日（{}） {}%H:%M開始")).format(week, ampm)
+            return "{}年{:02}月{:02}日（{}） {}{:02}:{:02}開始".format(y, mo, d, week, ampm, h, mi)
 
         @classmethod
         def to_field(cls, s: str, prefix: str) -> str:
@@ -2057,17 +2196,12 @@ def configure(keymap):
             if len(due) < 1:
                 print("Zoom format ERROR: could not parse due date.")
                 return copied
-            return os.linesep.join(
-                [
-                    cls.hr,
-                    cls.to_field(lines[2], ""),
-                    cls.to_field(due, ""),
-                    cls.to_field(lines[6], ""),
-                    "",
-                    cls.to_field(lines[8], "meeting ID"),
-                    cls.to_field(lines[9], "passcode"),
-                    cls.hr,
-                ]
+            return cls.template.format(
+                cls.to_field(lines[2], ""),
+                cls.to_field(due, ""),
+                cls.to_field(lines[6], ""),
+                cls.to_field(lines[8], "meeting ID"),
+                cls.to_field(lines[9], "passcode"),
             )
 
     def md_frontmatter() -> str:
@@ -2082,29 +2216,43 @@ def configure(keymap):
         )
 
     class FormatTools:
+        _reg_colon = re.compile(r"[:：]\s*")
+        _reg_postal = re.compile(r"(\d{3}).(\d{4})\s*(.+$)")
+        _reg_paren_inside_bracket = re.compile(r"(\(.+?\)|（.+?）)」")
+        _reg_dumb_quotation = re.compile(r"\"([^\"]+?)\"|'([^']+?)'")
+        _reg_honorific = re.compile(r"先生$|様$|(先生|様)(?=[、。：；（）［］・！？])")
+        _reg_url_unsafe = re.compile(r"[^0-9A-Za-z_.\-~/]")
+
+        _to_double_bracket = str.maketrans({"\u300c": "\u300e", "\u300d": "\u300f"})
+        _to_single_bracket = str.maketrans({"\u300e": "\u300c", "\u300f": "\u300d"})
+        _to_curly_comma = str.maketrans({"\u3001": "\uff0c"})
+        _to_japanese_comma = str.maketrans({"\uff0c": "\u3001"})
+        _strip_whitespaces = str.maketrans("", "", "\u200b\u3000\u0009\u0020")
+
         @staticmethod
         def to_deepl_friendly(s: str) -> str:
-            ss = []
-            lines = s.splitlines()
-            for line in lines:
-                if line.endswith(" "):
-                    ss.append(line)
-                elif line.endswith("-"):
-                    ss.append(line[0:-1])
-                else:
-                    ss.append(line + " ")
-            return "".join(ss).strip()
+            def _fix(line: str) -> str:
+                last = line[-1:]
+                if last == " ":
+                    return line
+                if last == "-":
+                    return line[:-1]
+                return line + " "
 
-        @staticmethod
-        def swap_abbreviation(s: str) -> str:
-            ss = re.split(r"[:：]\s*", s)
+            return "".join(_fix(line) for line in s.splitlines()).strip()
+
+        @classmethod
+        def swap_abbreviation(cls, s: str) -> str:
+            ss = cls._reg_colon.split(s)
             if len(ss) == 2:
                 return ss[1] + "：" + ss[0]
             return ""
 
-        @staticmethod
-        def colon_to_doubledash(s: str) -> str:
-            return re.sub(r"[:：]\s*", "\u2015\u2015", s)
+        @classmethod
+        def colon_to_doubledash(cls, s: str) -> str:
+            if ":" not in s and "：" not in s:
+                return s
+            return cls._reg_colon.sub("\u2015\u2015", s)
 
         @staticmethod
         def as_codeblock(s: str) -> str:
@@ -2113,147 +2261,163 @@ def configure(keymap):
         @staticmethod
         def skip_blank_line(s: str) -> str:
             lines = s.strip().splitlines()
-            return os.linesep.join([l for l in lines if l.strip()])
+            return os.linesep.join([l for l in lines if l and not l.isspace()])
 
         @staticmethod
-        def insert_blank_line(s: str) -> str:
-            lines = []
-            for line in s.strip().splitlines():
-                lines.append(line.strip())
-                lines.append("")
-            return os.linesep.join(lines)
+        def remove_linebreak(s: str) -> str:
+            return s.replace("\r\n", "").replace("\n", "")
+
+        @classmethod
+        def remove_whitespaces(cls, s: str) -> str:
+            return s.translate(cls._strip_whitespaces)
 
         @staticmethod
-        def to_double_bracket(s: str) -> str:
-            reg = re.compile(r"[\u300c\u300d]")
+        def remove_all_whitespaces(s: str) -> str:
+            return "".join(s.split())
 
-            def _replacer(mo: re.Match) -> str:
-                if mo.group(0) == "\u300c":
-                    return "\u300e"
-                return "\u300f"
+        @staticmethod
+        def insert_blank_line(s: str) -> str:
+            stripped = [line.strip() for line in s.strip().splitlines()]
+            lines = [""] * (2 * len(stripped))
+            lines[::2] = stripped
+            return os.linesep.join(lines)
+
+        @classmethod
+        def to_double_bracket(cls, s: str) -> str:
+            return s.translate(cls._to_double_bracket)
 
-            return reg.sub(_replacer, s)
+        @classmethod
+        def to_single_bracket(cls, s: str) -> str:
+            return s.translate(cls._to_single_bracket)
 
         @staticmethod
-        def to_single_bracket(s: str) -> str:
-            reg = re.compile(r"[\u300e\u300f]")
+        def shorten_amazon_url(s: str) -> str:
+            line, nl, rest = s.partition("\n")
+            i = line.find("amazon.co.jp/", 1)
+            if i < 0:
+                return s
+            j = line.rfind("dp/", i + 14, len(line) - 10)
+            if j < 0:
+                return s
+            return "https://www.amazon.jp/dp/" + line[j + 3 : j + 13] + nl + rest
 
-            def _replacer(mo: re.Match) -> str:
-                if mo.group(0) == "\u300e":
-                    return "\u300c"
-                return "\u300d"
+        @classmethod
+        def to_curly_comma(cls, s: str) -> str:
+            return s.translate(cls._to_curly_comma)
 
-            return reg.sub(_replacer, s)
+        @classmethod
+        def to_japanese_comma(cls, s: str) -> str:
+            return s.translate(cls._to_japanese_comma)
 
-        @staticmethod
-        def split_postalcode(s: str) -> str:
-            lines = s.splitlines()
-            if 1 < len(lines):
-                reg = re.compile(r"(\d{3}).(\d{4})[ 　]*(.+$)")
-            else:
-                reg = re.compile(r"(\d{3}).(\d{4})[\s]*(.+$)")
+        @classmethod
+        def split_postalcode(cls, s: str) -> str:
             ss = []
-            for line in lines:
-                hankaku = CharWidth().to_half_letter(line.strip().strip("\u3012"))
-                m = reg.match(hankaku)
+            for line in s.splitlines():
+                hankaku = CHAR_WIDTH.to_half_letter(line.strip().strip("\u3012"))
+                m = cls._reg_postal.match(hankaku)
                 if m:
                     ss.append("{}-{}\t{}".format(m.group(1), m.group(2), m.group(3)))
                 else:
                     ss.append(line)
             return os.linesep.join(ss)
 
-        @staticmethod
-        def fix_paren_inside_bracket(s: str) -> str:
-            reg = re.compile(r"(\(.+?\)|（.+?）)」")
-
+        @classmethod
+        def fix_paren_inside_bracket(cls, s: str) -> str:
             def _replacer(mo: re.Match) -> str:
                 return "」" + mo.group(1)
 
-            return reg.sub(_replacer, s)
-
-        @staticmethod
-        def fix_dumb_quotation(s: str) -> str:
-            reg = re.compile(r"\"([^\"]+?)\"|'([^']+?)'")
+            return cls._reg_paren_inside_bracket.sub(_replacer, s)
 
+        @classmethod
+        def fix_dumb_quotation(cls, s: str) -> str:
             def _replacer(mo: re.Match) -> str:
                 if str(mo.group(0)).startswith('"'):
                     return "\u201c{}\u201d".format(mo.group(1))
                 return "\u2018{}\u2019".format(mo.group(1))
 
-            return reg.sub(_replacer, s)
+            return cls._reg_dumb_quotation.sub(_replacer, s)
 
         @staticmethod
         def decode_url(s: str) -> str:
+            if "%" not in s:
+                return s
             return urllib.parse.unquote(s)
 
-        @staticmethod
-        def encode_url(s: str) -> str:
+        @classmethod
+        def encode_url(cls, s: str) -> str:
+            if not cls._reg_url_unsafe.search(s):
+                return s
             return urllib.parse.quote(s)
 
-        @staticmethod
-        def trim_honorific(s: str) -> str:
-            reg = re.compile(r"先生$|様$|(先生|様)(?=[、。：；（）［］・！？])")
-            return reg.sub("", s)
+        @classmethod
+        def trim_honorific(cls, s: str) -> str:
+            return cls._reg_honorific.sub("", s)
 
         @staticmethod
         def mdtable_from_tsv(s: str) -> str:
-            delim = "\t"
-
-            def _split(s: str) -> str:
-                return s.split(delim)
-
-            def _join(ss: list) -> str:
-                pipe = "|"
-                return pipe + pipe.join(ss) + pipe
-
             lines = s.splitlines()
-            header = _join(_split(lines[0]))
-            sep = _join([":---:" for _ in lines[0].split(delim)])
-            table = [
-                header,
-                sep,
-            ]
-            for line in lines[1:]:
-                table.append(_join(_split(line)))
+            if len(lines) < 1:
+                return ""
+            table = ["|" + line.replace("\t", "|") + "|" for line in lines]
+            sep = "|" + "|".join([":---:"] * (lines[0].count("\t") + 1)) + "|"
+            table.insert(1, sep)
             return os.linesep.join(table)
 
     class ClipboardMenu(ClipHandler):
+        _regs: Dict[str, re.Pattern] = {}
+
         def __init__(self) -> None:
             self._table = {}
+            self._menu = None
+
+        @staticmethod
+        def format_current(func: Callable, cb: str) -> str:
+            if cb:
+                return func(cb)
+            return ""
 
         @classmethod
         def invoke_formatter(cls, func: Callable) -> Callable:
-            def _formatter() -> str:
-                cb = cls.get_string()
-                if cb:
-                    return func(cb)
+            return functools.partial(cls.format_current, func)
 
-            return _formatter
+        @staticmethod
+        def replace_current(reg: re.Pattern, replace_to: str, anchors: str, cb: str) -> str:
+            if not cb:
+                return ""
+            if anchors and not any(c in cb for c in anchors):
+                return cb
+            return reg.sub(replace_to, cb)
 
         @classmethod
-        def invoke_replacer(cls, search: str, replace_to: str) -> Callable:
-            reg = re.compile(search)
-
-            def _replacer() -> str:
-                cb = cls.get_string()
-                if cb:
-                    return reg.sub(replace_to, cb)
-
-            return _replacer
+        def invoke_replacer(cls, search: str, replace_to: str, anchors: str = "") -> Callable:
+            reg = cls._regs.get(search)
+            if reg is None:
+                reg = re.compile(search)
+                cls._regs[search] = reg
+            return functools.partial(cls.replace_current, reg, replace_to, anchors)
 
         @property
         def table(self) -> dict:
             return self._table
 
+        @property
+        def menu(self) -> bytes:
+            if self._menu is None:
+                self._menu = "\n".join(self._table.keys()).encode("utf-8")
+            return self._menu
+
         def set_formatter(self, mapping: dict) -> None:
+            self._menu = None
             for menu, func in mapping.items():
                 self._table[menu] = self.invoke_formatter(func)
 
         def set_replacer(self, mapping: dict) -> None:
+            self._menu = None
             for menu, args in mapping.items():
                 self._table[menu] = self.invoke_replacer(*args)
 
         def set_func(self, mapping: dict) -> None:
+            self._menu = None
             for menu, func in mapping.items():
                 self._table[menu] = func
 
@@ -2265,64 +2429,69 @@ def configure(keymap):
             "colon to double-dash": FormatTools.colon_to_doubledash,
             "insert blank line": FormatTools.insert_blank_line,
             "remove blank line": FormatTools.skip_blank_line,
+            "remove linebreak": FormatTools.remove_linebreak,
+            "remove whitespaces": FormatTools.remove_whitespaces,
+            "remove whitespaces (including linebreak)": FormatTools.remove_all_whitespaces,
             "fix dumb quotation": FormatTools.fix_dumb_quotation,
-            "fix KANGXI RADICALS": KangxiRadicals().fix,
+            "fix KANGXI RADICALS": KangxiRadicals.fix,
             "fix paren inside bracket": FormatTools.fix_paren_inside_bracket,
             "to double bracket": FormatTools.to_double_bracket,
             "to single bracket": FormatTools.to_single_bracket,
+            "to curly-comma (\uff0c)": FormatTools.to_curly_comma,
+            "to japanese-comma (\u3001)": FormatTools.to_japanese_comma,
             "to markdown codeblock": FormatTools.as_codeblock,
             "TSV to markdown table": FormatTools.mdtable_from_tsv,
             "split postalcode and address": FormatTools.split_postalcode,
             "decode url": FormatTools.decode_url,
             "encode url": FormatTools.encode_url,
-            "to halfwidth": CharWidth().to_half_letter,
-            "to halfwidth (including symbols)": CharWidth(True).to_half_letter,
-            "to halfwidth symbols": CharWidth().to_half_symbol,
-            "to halfwidth bracktets": CharWidth().to_half_brackets,
-            "to fullwidth": CharWidth().to_full_letter,
-            "to fullwidth (including symbols)": CharWidth(True).to_full_letter,
-            "to fullwidth symbols": CharWidth().to_full_symbol,
-            "to fullwidth bracktets": CharWidth().to_full_brackets,
+            "shorten amazon url": FormatTools.shorten_amazon_url,
+            "to halfwidth": CHAR_WIDTH.to_half_letter,
+            "to halfwidth (including symbols)": CHAR_WIDTH_TOTALLY.to_half_letter,
+            "to halfwidth symbols": CharWidth.to_half_symbol,
+            "to halfwidth bracktets": CharWidth.to_half_brackets,
+            "to fullwidth": CHAR_WIDTH.to_full_letter,
+            "to fullwidth (including symbols)": CHAR_WIDTH_TOTALLY.to_full_letter,
+            "to fullwidth symbols": CharWidth.to_full_symbol,
+            "to fullwidth bracktets": CharWidth.to_full_brackets,
             "trim honorific": FormatTools.trim_honorific,
             "zoom invitation": Zoom().format,
         }
     )
     CLIPBOARD_MENU.set_replacer(
         {
-            "escape backslash": (r"\\", r"\\\\"),
-            "escape double-quotation": (r"\"", r'\\"'),
-            "remove double-quotation": (r'"', ""),
-            "remove single-quotation": (r"'", ""),
-            "remove linebreak": (r"\r?\n", ""),
-            "remove whitespaces": (r"[\u200b\u3000\u0009\u0020]", ""),
-            "remove whitespaces (including linebreak)": (r"\s", ""),
+            "escape backslash": (r"\\", r"\\\\", "\\"),
+            "escape double-quotation": (r"\"", r'\\"', '"'),
+            "remove double-quotation": (r'"', "", '"'),
+            "remove single-quotation": (r"'", "", "'"),
             "remove non-digit-char": (r"[^\d]", ""),
-            "remove quotations": (r"[\u0022\u0027]", ""),
+            "remove quotations": (r"[\u0022\u0027]", "", "\"'"),
             "remove inside paren": (r"[（\(].+?[）\)]", ""),
-            "fix msword-bullet": (r"\uf09f\u0009", "\u30fb"),
-            "to curly-comma (\uff0c)": (r"\u3001", "\uff0c"),
-            "to japanese-comma (\u3001)": (r"\uff0c", "\u3001"),
-            "shorten amazon url": (
-                r"^.+amazon\.co\.jp/.+dp/(.{10}).*",
-                r"https://www.amazon.jp/dp/\1",
-            ),
+            "remove inside paren and quotations": (r"[（\(].+?[）\)]|[\u0022\u0027]", ""),
+            "fix msword-bullet": (r"\uf09f\u0009", "\u30fb", "\uf09f"),
         }
     )
     CLIPBOARD_MENU.set_func(
         {
-            "to lowercase": lambda: ClipHandler.get_string().lower(),
-            "to uppercase": lambda: ClipHandler.get_string().upper(),
-            "my markdown frontmatter": md_frontmatter,
+            "to lowercase": lambda cb: cb.lower(),
+            "to uppercase": lambda cb: cb.upper(),
+            "my markdown frontmatter": lambda _: md_frontmatter(),
         }
     )
 
-    def check_fzf() -> bool:
-        paths = os.environ.get("PATH", "").split(os.pathsep)
-        for path in paths:
-            p = Path(path, "fzf.exe")
-            if smart_check_path(p):
-                return True
-        return False
+    class FzfFinder:
+        _found = ""
+
+        @classmethod
+        def find(cls) -> str:
+            if cls._found:
+                return cls._found
+            paths = os.environ.get("PATH", "").split(os.pathsep)
+            for path in paths:
+                p = Path(path, "fzf.exe")
+                if smart_check_path(p):
+                    cls._found = str(p)
+                    break
+            return cls._found
 
     class FzfResult(NamedTuple):
         finisher: str
@@ -2340,23 +2509,24 @@ def configure(keymap):
             if not self.expect:
                 return FzfResult(self.default_finisher, stdout)
             lines = stdout.splitlines()
-            try:
-                assert (
-                    len(lines) == 2
-                ), "with --expect option, 2 lines should be returned, but 3 or more lines are returned"
-            except AssertionError as err:
-                print(err, file=sys.stderr)
+            if len(lines) != 2:
+                print(
+                    "with --expect option, 2 lines should be returned, but 3 or more lines are returned",
+                    file=sys.stderr,
+                )
                 return FzfResult(self.default_finisher, "")
             if len(lines[0]) < 1:
                 return FzfResult(self.default_finisher, lines[1])
             return FzfResult(*lines)
 
     def fzfmenu() -> None:
-        if not check_fzf():
+        fzf_path = FzfFinder.find()
+        if not fzf_path:
             balloon("cannot find fzf on PC.")
             return
 
-        if not ClipHandler.get_string():
+        cb = ClipHandler.get_string()
+        if not cb:
             balloon("no text in clipboard.")
             return
 
@@ -2366,22 +2536,20 @@ def configure(keymap):
             job_item.result = False
             job_item.paste_string = ""
             job_item.skip_paste = False
-            lines = "\n".join(table.keys())
             proc = subprocess.run(
-                ["fzf.exe", "--expect", "ctrl-space"],
-                input=lines,
+                [fzf_path, "--expect", "ctrl-space"],
+                input=CLIPBOARD_MENU.menu,
                 capture_output=True,
-                encoding="utf-8",
             )
-            result = proc.stdout
-            if len(result) < 1 or proc.returncode != 0:
+            if len(proc.stdout) < 1 or proc.returncode != 0:
                 return
+            result = proc.stdout.decode("utf-8", "replace")
             fr = FzfResultParser(True).parse(result)
             result_func = fr.text
             skip = fr.finisher != FzfResultParser.default_finisher
             func = table.get(result_func, None)
             if func:
-                fmt = func()
+                fmt = func(cb)
                 if 0 < len(fmt):
                     job_item.result = True
                     job_item.paste_string = fmt
@@ -2390,7 +2558,8 @@ def configure(keymap):
         def _finished(job_item: ckit.JobItem) -> None:
             if job_item.result and job_item.paste_string:
                 if job_item.skip_paste:
-                    ClipHandler.set_string(job_item.paste_string)
+                    if job_item.paste_string != cb:
+                        ClipHandler.set_string(job_item.paste_string)
                 else:
                     ClipHandler.paste(job_item.paste_string)
 